@@ -11,6 +11,10 @@ ALERT_STYLES = {
     "CAUTION": ("F85149", "FEE2E2", "Caution", "F85149"),
 }
 
+# "!TYPE]" marker text -> alert type, for GitHub's canonical uppercase form:
+# detecting the common case is one dict hit, no slice/upper allocation.
+_ALERT_MARKERS = {f"!{k}]": k for k in ALERT_STYLES}
+
 
 def detect_alert_type(token):
     """Check if a block_quote token is a GitHub-style alert.
@@ -42,6 +46,11 @@ def detect_alert_type(token):
     if first_raw != "[":
         return None
 
+    alert_type = _ALERT_MARKERS.get(second_raw)
+    if alert_type:
+        return alert_type
+
+    # Non-canonical casing ([!note]): normalize and retry.
     if second_raw.startswith("!") and second_raw.endswith("]"):
         alert_type = second_raw[1:-1].upper()
         if alert_type in ALERT_STYLES:
@@ -50,6 +59,52 @@ def detect_alert_type(token):
     return None
 
 
+def alert_replacement(token):
+    """Build the alert replacement token for a GitHub-style alert blockquote.
+
+    Returns None when *token* is not a ``block_quote`` carrying an alert
+    marker. Otherwise strips the ``[!TYPE]`` marker (and any leading
+    softbreak) from the first paragraph and returns an ``alert`` token
+    wrapping the remaining body children.
+    """
+    if token.get("type") != "block_quote":
+        return None
+    alert_type = detect_alert_type(token)
+    if not alert_type:
+        return None
+
+    children = token.get("children", [])
+
+    # Strip the [!TYPE] marker from the first paragraph's inlines
+    if children and children[0].get("type") == "paragraph":
+        first_para = children[0]
+        inlines = first_para.get("children", [])
+
+        # Remove the "[" and "!TYPE]" text nodes (first two inlines)
+        stripped = inlines[2:]
+
+        # Remove leading softbreak if present
+        if stripped and stripped[0].get("type") == "softbreak":
+            stripped = stripped[1:]
+
+        if stripped:
+            # Keep the first paragraph with remaining inlines
+            body_children = [{"type": "paragraph", "children": stripped}] + [
+                c for c in children[1:] if c.get("type") != "blank_line"
+            ]
+        else:
+            # First paragraph had only the marker; use remaining children.
+            body_children = [c for c in children[1:] if c.get("type") != "blank_line"]
+    else:
+        body_children = children
+
+    return {
+        "type": "alert",
+        "attrs": {"alert_type": alert_type},
+        "children": body_children,
+    }
+
+
 def preprocess_alerts(tokens):
     """Scan AST (including inside list items and nested blockquotes) for
     GitHub-style alerts in blockquotes and replace them with alert tokens.
@@ -58,49 +113,8 @@ def preprocess_alerts(tokens):
     def visit(token_list):
         result = []
         for token in token_list:
-            if token.get("type") == "block_quote":
-                alert_type = detect_alert_type(token)
-                if alert_type:
-                    children = token.get("children", [])
-
-                    # Strip the [!TYPE] marker from the first paragraph's inlines
-                    if children and children[0].get("type") == "paragraph":
-                        first_para = children[0]
-                        inlines = first_para.get("children", [])
-
-                        # Remove the "[" and "!TYPE]" text nodes (first two inlines)
-                        stripped = inlines[2:]
-
-                        # Remove leading softbreak if present
-                        if stripped and stripped[0].get("type") == "softbreak":
-                            stripped = stripped[1:]
-
-                        if stripped:
-                            # Keep the first paragraph with remaining inlines
-                            body_children = [
-                                {"type": "paragraph", "children": stripped}
-                            ] + [
-                                c for c in children[1:] if c.get("type") != "blank_line"
-                            ]
-                        else:
-                            # First paragraph had only the marker; use
-                            # remaining children.
-                            body_children = [
-                                c for c in children[1:] if c.get("type") != "blank_line"
-                            ]
-                    else:
-                        body_children = children
-
-                    result.append(
-                        {
-                            "type": "alert",
-                            "attrs": {"alert_type": alert_type},
-                            "children": body_children,
-                        }
-                    )
-                    continue
-
-            result.append(token)
+            replacement = alert_replacement(token)
+            result.append(token if replacement is None else replacement)
         return result
 
     return walk_block_containers(tokens, visit)
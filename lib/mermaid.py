@@ -1,26 +1,38 @@
 """Mermaid diagram preprocessing -- renders mermaid code blocks to PNG via mmdc."""
 
+import functools
 import hashlib
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from lib.parser import walk_block_containers
 
-TEMP_DIR = Path(tempfile.gettempdir()) / "markdown2docx"
+MERMAID_THEMES = ("default", "neutral", "dark", "forest")
 
 
-MERMAID_THEMES = ("default", "neutral", "dark", "forest")
+@functools.lru_cache(maxsize=1)
+def _temp_dir():
+    """Working directory for mermaid sources and rendered PNGs.
+
+    Resolved lazily (and cached) so importing the module does no path
+    work, and tests can monkeypatch ``tempfile.gettempdir``.
+    """
+    return Path(tempfile.gettempdir()) / "markdown2docx"
+
 
+MMDC_TIMEOUT = 30
+MMDC_MAX_WORKERS = 4
 
-def _render_mermaid_to_png(raw, index, theme, transparent_bg):
-    """Invoke mmdc to render mermaid source to a PNG; return the PNG path."""
-    TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    digest = hashlib.md5(raw.encode()).hexdigest()[:10]
-    name = f"mermaid_{index}_{digest}"
-    mmd_path = TEMP_DIR / f"{name}.mmd"
-    png_path = TEMP_DIR / f"{name}.png"
 
+def _render_mermaid_to_png(raw, mmd_path, png_path, theme, transparent_bg):
+    """Write mermaid source and invoke mmdc to render it to a PNG.
+
+    Returns None on success, or a short error description on failure, so
+    one broken diagram degrades to a placeholder instead of aborting the
+    whole conversion (and the sibling renders already in flight).
+    """
     mmd_path.write_text(raw)
     cmd = [
         "mmdc",
@@ -39,47 +51,127 @@ def _render_mermaid_to_png(raw, index, theme, transparent_bg):
         cmd.extend(["-b", "transparent"])
     if theme:
         cmd.extend(["-t", theme])
-    subprocess.run(cmd, check=True)
-    return png_path
+    try:
+        proc = subprocess.run(
+            cmd, check=False, timeout=MMDC_TIMEOUT, capture_output=True
+        )
+    except subprocess.TimeoutExpired:
+        return f"mmdc timed out after {MMDC_TIMEOUT}s"
+    if proc.returncode != 0:
+        stderr = (proc.stderr or b"").decode(errors="replace").strip()
+        return stderr[:200] or f"mmdc exited with status {proc.returncode}"
+    return None
+
+
+def mermaid_replacement(token, jobs, scheduled, theme, transparent_bg):
+    """Build the image-paragraph replacement for a mermaid ``block_code`` token.
+
+    Returns None when *token* is not a mermaid code block. Output files are
+    content-addressed (hash of source plus rendering options), so a diagram
+    whose PNG already exists is reused without invoking mmdc at all, and
+    textually identical diagrams collide on *scheduled* and render once.
+    Otherwise a ``(raw, mmd_path, png_path, paragraphs)`` job is appended to
+    *jobs* for ``render_mermaid_jobs`` to run after the walk; *paragraphs*
+    collects every replacement paragraph depending on that render so a
+    failure can rewrite them into error placeholders.
+    """
+    if token.get("type") != "block_code":
+        return None
+    info = (token.get("attrs") or {}).get("info", "")
+    lang = info.split(None, 1)[0] if info else ""
+    if lang != "mermaid":
+        return None
+
+    raw = token.get("raw", "") or token.get("text", "")
+    # Hash the options too: the same source renders differently per
+    # theme/background.
+    key = "\x00".join((raw, theme or "", "t" if transparent_bg else ""))
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    name = f"mermaid_{digest}"
+    temp_dir = _temp_dir()
+    mmd_path = temp_dir / f"{name}.mmd"
+    png_path = temp_dir / f"{name}.png"
+    replacement = {
+        "type": "paragraph",
+        "children": [
+            {
+                "type": "image",
+                "attrs": {
+                    "src": str(png_path),
+                    "alt": "mermaid diagram",
+                },
+            }
+        ],
+    }
+    if png_path in scheduled:
+        scheduled[png_path].append(replacement)
+    elif not png_path.exists():
+        paragraphs = [replacement]
+        scheduled[png_path] = paragraphs
+        jobs.append((raw, mmd_path, png_path, paragraphs))
+    return replacement
+
+
+def render_mermaid_jobs(jobs, theme=None, transparent_bg=False):
+    """Run the collected ``(raw, mmd_path, png_path, paragraphs)`` jobs
+    concurrently.
+
+    The mmdc invocations are independent of each other (and of token
+    order), so they run on a thread pool. Each mmdc run spawns Node plus a
+    headless Chromium, so N diagrams rendered concurrently cost roughly one
+    startup of wall time instead of N.
+
+    A failed render (nonzero exit or timeout) does not abort the batch:
+    every paragraph referencing the missing PNG is rewritten in place into
+    a text placeholder carrying the mmdc error.
+    """
+    if not jobs:
+        return
+    _temp_dir().mkdir(parents=True, exist_ok=True)
+    # Each worker spawns Node plus a headless Chromium (hundreds of MB);
+    # cap the pool so a diagram-heavy document doesn't exhaust memory.
+    max_workers = min(len(jobs), MMDC_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(
+                _render_mermaid_to_png,
+                raw,
+                mmd_path,
+                png_path,
+                theme,
+                transparent_bg,
+            )
+            for raw, mmd_path, png_path, _ in jobs
+        ]
+        for future, (_, _, _, paragraphs) in zip(futures, jobs):
+            error = future.result()
+            if error:
+                for paragraph in paragraphs:
+                    paragraph["children"] = [
+                        {"type": "text", "raw": f"[Mermaid error: {error}]"}
+                    ]
 
 
 def preprocess_mermaid(tokens, base_dir, theme=None, transparent_bg=False):
     """Scan AST (including inside list items/blockquotes) for mermaid code
     blocks and replace them with image paragraph tokens.
+
+    The walk only records each diagram and its target paths; the renders
+    run afterwards via ``render_mermaid_jobs``. Unchanged diagrams are free
+    on re-conversion thanks to the content-addressed PNG cache.
     """
-    # Shared counter so diagram indices remain unique across the whole document.
-    counter = [0]
+    jobs = []
+    scheduled = {}
 
     def visit(token_list):
         result = []
         for token in token_list:
-            if token.get("type") == "block_code":
-                info = (
-                    token.get("attrs", {}).get("info", "") if token.get("attrs") else ""
-                )
-                lang = info.split()[0] if info else ""
-                if lang == "mermaid":
-                    raw = token.get("raw", "") or token.get("text", "")
-                    png_path = _render_mermaid_to_png(
-                        raw, counter[0], theme, transparent_bg
-                    )
-                    counter[0] += 1
-                    result.append(
-                        {
-                            "type": "paragraph",
-                            "children": [
-                                {
-                                    "type": "image",
-                                    "attrs": {
-                                        "src": str(png_path),
-                                        "alt": "mermaid diagram",
-                                    },
-                                }
-                            ],
-                        }
-                    )
-                    continue
-            result.append(token)
+            replacement = mermaid_replacement(
+                token, jobs, scheduled, theme, transparent_bg
+            )
+            result.append(token if replacement is None else replacement)
         return result
 
-    return walk_block_containers(tokens, visit)
+    tokens = walk_block_containers(tokens, visit)
+    render_mermaid_jobs(jobs, theme=theme, transparent_bg=transparent_bg)
+    return tokens
@@ -1,5 +1,6 @@
 """Shared Markdown parsing utilities."""
 
+import functools
 import os
 import re
 from pathlib import Path
@@ -13,17 +14,27 @@ CONTAINER_TYPES = ("list", "list_item", "block_quote", "alert")
 
 
 def extract_text(children):
-    """Recursively extract plain text from token children."""
-    if children is None:
+    """Extract plain text from token children, depth-first.
+
+    Iterative (explicit stack) rather than recursive: deeply nested inline
+    markup would otherwise pay a Python frame and an intermediate join per
+    nesting level; here every fragment lands in one flat list joined once.
+    """
+    if not children:
         return ""
     parts = []
-    for child in children:
-        if child.get("raw"):
-            parts.append(child["raw"])
-        elif child.get("text"):
-            parts.append(child["text"])
-        elif child.get("children"):
-            parts.append(extract_text(child["children"]))
+    stack = [iter(children)]
+    while stack:
+        for child in stack[-1]:
+            if child.get("raw"):
+                parts.append(child["raw"])
+            elif child.get("text"):
+                parts.append(child["text"])
+            elif child.get("children"):
+                stack.append(iter(child["children"]))
+                break
+        else:
+            stack.pop()
     return "".join(parts)
 
 
@@ -52,15 +63,27 @@ def build_heading_anchor_map(tokens):
     return anchor_map
 
 
+@functools.lru_cache(maxsize=256)
 def resolve_image_path(url, base_dir):
-    """Resolve image path relative to base_dir or as absolute."""
+    """Resolve image path relative to base_dir or as absolute.
+
+    Cached: documents commonly repeat the same image (logos, icons), and
+    Path construction plus joining is pure allocation churn the second
+    time around. Paths are immutable, so sharing the result is safe.
+    """
     if os.path.isabs(url):
         return Path(url)
     return Path(base_dir) / url
 
 
+@functools.lru_cache(maxsize=1)
 def create_parser():
-    """Create and return a mistune Markdown parser with GFM plugins."""
+    """Return the mistune Markdown parser with GFM plugins.
+
+    Cached: plugin registration compiles a pile of regexes, and the parser
+    itself is stateless across calls (each invocation builds fresh parse
+    state), so every file — and every table re-parse — shares one instance.
+    """
     return mistune.create_markdown(
         renderer="ast",
         plugins=["table", "strikethrough", "task_lists"],
@@ -88,6 +111,18 @@ def walk_block_containers(tokens, visit):
     return tokens
 
 
+def normalize_image_attrs(token):
+    """Rename 'url' to 'src' on a token's image children, in place."""
+    children = token.get("children")
+    if not children:
+        return
+    for child in children:
+        if child.get("type") == "image":
+            attrs = child.get("attrs", {})
+            if attrs and "url" in attrs:
+                attrs["src"] = attrs.pop("url")
+
+
 def preprocess_images(tokens):
     """Normalize image attrs: rename 'url' to 'src' so all images use the same key.
 
@@ -97,14 +132,7 @@ def preprocess_images(tokens):
 
     def visit(token_list):
         for token in token_list:
-            children = token.get("children")
-            if not children:
-                continue
-            for child in children:
-                if child.get("type") == "image":
-                    attrs = child.get("attrs", {})
-                    if attrs and "url" in attrs:
-                        attrs["src"] = attrs.pop("url")
+            normalize_image_attrs(token)
         return token_list
 
     return walk_block_containers(tokens, visit)
@@ -160,6 +188,28 @@ def _paragraph_as_table_text(paragraph):
     return "\n".join(lines) + "\n"
 
 
+def reparse_tables_in_list_item(token, parser):
+    """Re-parse table-shaped paragraphs among a list_item's children, in place.
+
+    No-op for tokens that aren't list items or have no table-shaped
+    paragraph children.
+    """
+    if token.get("type") != "list_item":
+        return
+    new_children = []
+    changed = False
+    for child in token.get("children", []):
+        if child.get("type") == "paragraph":
+            src = _paragraph_as_table_text(child)
+            if src:
+                new_children.extend(parser(src))
+                changed = True
+                continue
+        new_children.append(child)
+    if changed:
+        token["children"] = new_children
+
+
 def preprocess_tables_in_lists(tokens):
     """Detect GFM tables lost inside list items and re-parse them as tables.
 
@@ -172,20 +222,8 @@ def preprocess_tables_in_lists(tokens):
     parser = create_parser()
 
     def visit(token_list):
-        result = []
         for token in token_list:
-            if token.get("type") == "list_item":
-                new_children = []
-                for child in token.get("children", []):
-                    if child.get("type") == "paragraph":
-                        src = _paragraph_as_table_text(child)
-                        if src:
-                            reparsed = parser(src)
-                            new_children.extend(reparsed)
-                            continue
-                    new_children.append(child)
-                token["children"] = new_children
-            result.append(token)
-        return result
+            reparse_tables_in_list_item(token, parser)
+        return token_list
 
     return walk_block_containers(tokens, visit)
@@ -0,0 +1,53 @@
+"""Fused AST preprocessing -- all passes applied in a single tree walk."""
+
+from lib.alerts import alert_replacement
+from lib.mermaid import mermaid_replacement, render_mermaid_jobs
+from lib.parser import (
+    create_parser,
+    normalize_image_attrs,
+    reparse_tables_in_list_item,
+    walk_block_containers,
+)
+
+
+def preprocess_all(tokens, base_dir, theme=None, transparent_bg=False):
+    """Apply every preprocessing pass in one ``walk_block_containers`` walk.
+
+    Equivalent to running ``preprocess_mermaid``, ``preprocess_tables_in_lists``,
+    ``preprocess_alerts`` and ``preprocess_images`` in sequence, but each
+    container level is traversed (and its token list rebuilt) once instead
+    of four times. Mermaid render jobs are still collected during the walk
+    and executed concurrently afterwards.
+    """
+    jobs = []
+    scheduled = {}
+    reparse_parser = create_parser()
+
+    def visit(token_list):
+        # Replacements are written back in place rather than into a fresh
+        # list, so documents without diagrams or alerts (the common case)
+        # pay only the walk, not a copy of every container's children.
+        for i, token in enumerate(token_list):
+            t = token.get("type")
+            if t == "block_code":
+                replacement = mermaid_replacement(
+                    token, jobs, scheduled, theme, transparent_bg
+                )
+                if replacement is not None:
+                    token_list[i] = replacement
+                    continue
+            elif t == "list_item":
+                reparse_tables_in_list_item(token, reparse_parser)
+            elif t == "block_quote":
+                replacement = alert_replacement(token)
+                if replacement is not None:
+                    # The alert is a container; its children (including any
+                    # images) are normalized when the walk descends into it.
+                    token_list[i] = replacement
+                    continue
+            normalize_image_attrs(token)
+        return token_list
+
+    tokens = walk_block_containers(tokens, visit)
+    render_mermaid_jobs(jobs, theme=theme, transparent_bg=transparent_bg)
+    return tokens
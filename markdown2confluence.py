@@ -6,17 +6,15 @@ from pathlib import Path
 
 import click
 
-from lib.alerts import preprocess_alerts
 from lib.confluence import ConfluenceClient
-from lib.mermaid import MERMAID_THEMES, preprocess_mermaid
+from lib.mermaid import MERMAID_THEMES
 from lib.parser import (
     build_heading_anchor_map,
     create_parser,
     extract_text,
-    preprocess_images,
-    preprocess_tables_in_lists,
     resolve_image_path,
 )
+from lib.preprocess import preprocess_all
 
 
 # ---------------------------------------------------------------------------
@@ -782,12 +780,9 @@ def convert_file(
 
     md = create_parser()
     tokens = md(md_text)
-    tokens = preprocess_mermaid(
+    tokens = preprocess_all(
         tokens, base_dir, theme=theme, transparent_bg=transparent_bg
     )
-    tokens = preprocess_tables_in_lists(tokens)
-    tokens = preprocess_alerts(tokens)
-    tokens = preprocess_images(tokens)
     anchor_map = build_heading_anchor_map(tokens)
 
     if page_id:
@@ -1,5 +1,11 @@
 """markdown2docx -- Convert GitHub Flavored Markdown files to DOCX format."""
 
+import functools
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from copy import deepcopy
 from pathlib import Path
 
 import click
@@ -12,6 +18,7 @@ from docx.shared import Inches, Pt, RGBColor
 from pygments import lex
 from pygments.lexers import TextLexer, get_lexer_by_name
 from pygments.token import (
+    STANDARD_TYPES,
     Comment,
     Error,
     Generic,
@@ -25,16 +32,16 @@ from pygments.token import (
     Token,
 )
 
-from lib.alerts import ALERT_STYLES, preprocess_alerts
-from lib.mermaid import MERMAID_THEMES, preprocess_mermaid
+from lib.alerts import ALERT_STYLES
+from lib.mermaid import MERMAID_THEMES
 from lib.parser import (
     create_parser,
     extract_text,
     heading_slug,
-    preprocess_images,
-    preprocess_tables_in_lists,
     resolve_image_path,
+    walk_block_containers,
 )
+from lib.preprocess import preprocess_all
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -48,6 +55,18 @@ MAX_IMAGE_HEIGHT = Inches(8)
 
 _bookmark_id_counter = 0
 
+# qn() re-parses the prefixed name and resolves its namespace on every call;
+# the attribute names hit once or more per paragraph are resolved here once.
+_QN_VAL = qn("w:val")
+_QN_COLOR = qn("w:color")
+_QN_FILL = qn("w:fill")
+_QN_LEFT = qn("w:left")
+_QN_RID = qn("r:id")
+_QN_ANCHOR = qn("w:anchor")
+_QN_XML_SPACE = qn("xml:space")
+_QN_ASCII = qn("w:ascii")
+_QN_HANSI = qn("w:hAnsi")
+
 # Pygments token type -> (hex_color, bold, italic)
 TOKEN_STYLES = {
     Comment: ("008000", False, True),
@@ -76,21 +95,188 @@ TOKEN_STYLES = {
     Error: ("FF0000", False, False),
 }
 
+# ---------------------------------------------------------------------------
+# XML templates
+# ---------------------------------------------------------------------------
+#
+# OxmlElement() and qn() pay a namespace parse/lookup on every call, and the
+# shading/border/hyperlink subtrees below are rebuilt identically for every
+# paragraph they decorate. The fixed parts are built once here and
+# deep-copied per use; only the variable attributes (colors) get patched.
+
+
+def _make_element(tag, attrs=None):
+    """Build an OxmlElement with qualified attributes set."""
+    elem = OxmlElement(tag)
+    for name, value in (attrs or {}).items():
+        elem.set(qn(name), value)
+    return elem
+
+
+_SHD_TEMPLATE = _make_element("w:shd", {"w:val": "clear", "w:color": "auto"})
+
+# Left paragraph border (blockquotes and alerts); w:color patched per use.
+_PBDR_LEFT_TEMPLATE = _make_element("w:pBdr")
+_PBDR_LEFT_TEMPLATE.append(
+    _make_element("w:left", {"w:val": "single", "w:sz": "12", "w:space": "4"})
+)
+
+# Bottom paragraph border (thematic breaks); fully fixed.
+_PBDR_BOTTOM_TEMPLATE = _make_element("w:pBdr")
+_PBDR_BOTTOM_TEMPLATE.append(
+    _make_element(
+        "w:bottom",
+        {"w:val": "single", "w:sz": "6", "w:space": "1", "w:color": "auto"},
+    )
+)
+
+# Run properties for hyperlink text (blue + underline); fully fixed.
+_HYPERLINK_RPR_TEMPLATE = _make_element("w:rPr")
+_HYPERLINK_RPR_TEMPLATE.append(_make_element("w:color", {"w:val": "0563C1"}))
+_HYPERLINK_RPR_TEMPLATE.append(_make_element("w:u", {"w:val": "single"}))
+
+
 # ---------------------------------------------------------------------------
 # Pure helper functions
 # ---------------------------------------------------------------------------
 
 
-def get_token_style(token_type):
-    """Walk Pygments token hierarchy to find matching style."""
+def _resolve_token_style(token_type):
+    """Walk Pygments token hierarchy to find matching style.
+
+    Resolved styles carry a parsed ``RGBColor`` (or None) rather than the
+    hex string, so the render loop assigns colors directly instead of
+    re-parsing hex per run.
+    """
     t = token_type
     while t is not Token:
         if t in TOKEN_STYLES:
-            return TOKEN_STYLES[t]
+            color_hex, bold, italic = TOKEN_STYLES[t]
+            rgb = RGBColor.from_string(color_hex) if color_hex else None
+            return (rgb, bold, italic)
         t = t.parent
     return None
 
 
+# Every standard Pygments token type resolved to its nearest ancestor style
+# once at import time, so the per-token lookup in render_block_code is a
+# single dict hit instead of a hierarchy walk.
+_RESOLVED_STYLES = {t: _resolve_token_style(t) for t in STANDARD_TYPES}
+
+
+def get_token_style(token_type):
+    """Look up the style for a Pygments token type.
+
+    Precomputed for all standard token types; non-standard types (custom
+    lexers) resolve on first use and are cached.
+    """
+    try:
+        return _RESOLVED_STYLES[token_type]
+    except KeyError:
+        style = _resolve_token_style(token_type)
+        _RESOLVED_STYLES[token_type] = style
+        return style
+
+
+# CODE_FONT_SIZE in w:sz units (half-points), precomputed for _fast_code_run.
+_CODE_SZ = str(int(CODE_FONT_SIZE.pt * 2))
+
+
+def _code_rpr(style):
+    """Build the ``w:rPr`` subtree for a resolved code-run style."""
+    rpr = OxmlElement("w:rPr")
+    rfonts = OxmlElement("w:rFonts")
+    rfonts.set(_QN_ASCII, CODE_FONT)
+    rfonts.set(_QN_HANSI, CODE_FONT)
+    rpr.append(rfonts)
+    if style:
+        rgb, bold, italic = style
+        if bold:
+            rpr.append(OxmlElement("w:b"))
+        if italic:
+            rpr.append(OxmlElement("w:i"))
+        if rgb is not None:
+            color = OxmlElement("w:color")
+            color.set(_QN_VAL, str(rgb))
+            rpr.append(color)
+    sz = OxmlElement("w:sz")
+    sz.set(_QN_VAL, _CODE_SZ)
+    rpr.append(sz)
+    sz_cs = OxmlElement("w:szCs")
+    sz_cs.set(_QN_VAL, _CODE_SZ)
+    rpr.append(sz_cs)
+    return rpr
+
+
+# Newlines and tabs must become w:br/w:tab elements: Word ignores the
+# literal characters inside w:t.
+_RUN_CONTENT_RE = re.compile("([\t\n])")
+
+
+def _append_run_content(r, text):
+    """Append *text* to run element *r* as ``w:t``/``w:br``/``w:tab`` children.
+
+    Mirrors python-docx's run-content appender, which the raw-OOXML run
+    helpers bypass: newlines and tabs are emitted as ``w:br``/``w:tab``
+    elements, and ``w:t`` fragments with significant edge whitespace get
+    ``xml:space="preserve"``.
+    """
+    for part in _RUN_CONTENT_RE.split(text):
+        if part == "\n":
+            r.append(OxmlElement("w:br"))
+        elif part == "\t":
+            r.append(OxmlElement("w:tab"))
+        elif part:
+            t = OxmlElement("w:t")
+            if part[:1] == " " or part[-1:] == " ":
+                t.set(_QN_XML_SPACE, "preserve")
+            t.text = part
+            r.append(t)
+
+
+# The rPr subtree is identical for every run of a given style and the style
+# set is tiny; build each once and deepcopy per run -- cloning a small lxml
+# tree beats reconstructing its four-to-seven child elements.
+_CODE_RPR_CACHE = {}
+
+
+def _fast_code_run(text, style):
+    """Build one styled code run as a raw OOXML ``w:r`` element.
+
+    ``add_run`` plus four or five font setters each walk python-docx's
+    descriptor machinery and re-query the run's ``rPr`` element; in the
+    code-block loop that dispatch dominates. Cloning a prebuilt ``w:rPr``
+    and attaching the text directly costs two element constructions.
+    """
+    r = OxmlElement("w:r")
+    try:
+        rpr = _CODE_RPR_CACHE[style]
+    except KeyError:
+        rpr = _CODE_RPR_CACHE[style] = _code_rpr(style)
+    r.append(deepcopy(rpr))
+    _append_run_content(r, text)
+    return r
+
+
+_TEXT_LEXER = TextLexer()
+
+
+@functools.lru_cache(maxsize=64)
+def _get_lexer(lang):
+    """Look up a Pygments lexer by language name, cached per language.
+
+    Registry traversal plus lexer construction is pure waste when a document
+    repeats the same language across code blocks. Unknown or empty languages
+    fall back to a shared plain-text lexer (no highlighting).
+    """
+    if not lang:
+        return _TEXT_LEXER
+    try:
+        return get_lexer_by_name(lang)
+    except Exception:
+        return _TEXT_LEXER
+
+
 def calculate_image_dimensions(img_path, max_width, max_height):
     """Calculate dimensions to fit within bounding box, preserving aspect ratio."""
     image = DocxImage.from_file(str(img_path))
@@ -105,6 +291,49 @@ def calculate_image_dimensions(img_path, max_width, max_height):
     return width, height
 
 
+def preprocess_image_dims(tokens, base_dir):
+    """Size every distinct image in the AST once, up front.
+
+    Walks the token tree (including containers), resolves each image ``src``
+    and returns ``{resolved_path_str: (width, height) or None}`` — ``None``
+    for images missing on disk. ``add_image`` consults this map so a
+    document that references the same image many times parses its header
+    exactly once instead of once per reference.
+
+    The stat + header read per distinct path runs on a thread pool: each is
+    a latency-bound filesystem call, so overlapping them matters on slow
+    (network/FUSE) filesystems with many images.
+    """
+    paths = {}
+
+    def visit(token_list):
+        for token in token_list:
+            children = token.get("children")
+            if not children:
+                continue
+            for child in children:
+                if child.get("type") != "image":
+                    continue
+                src = (child.get("attrs") or {}).get("src", "")
+                if not src:
+                    continue
+                img_path = resolve_image_path(src, base_dir)
+                paths.setdefault(str(img_path), img_path)
+        return token_list
+
+    walk_block_containers(tokens, visit)
+    if not paths:
+        return {}
+
+    def load(img_path):
+        if not img_path.exists():
+            return None
+        return calculate_image_dimensions(img_path, MAX_IMAGE_WIDTH, MAX_IMAGE_HEIGHT)
+
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as pool:
+        return dict(zip(paths, pool.map(load, paths.values())))
+
+
 # ---------------------------------------------------------------------------
 # Side-effect functions (mutate doc or paragraph)
 # ---------------------------------------------------------------------------
@@ -113,13 +342,19 @@ def calculate_image_dimensions(img_path, max_width, max_height):
 def set_paragraph_shading(paragraph, color_hex):
     """Set background shading on a paragraph via XML manipulation."""
     p_pr = paragraph._p.get_or_add_pPr()
-    shd = OxmlElement("w:shd")
-    shd.set(qn("w:val"), "clear")
-    shd.set(qn("w:color"), "auto")
-    shd.set(qn("w:fill"), color_hex)
+    shd = deepcopy(_SHD_TEMPLATE)
+    shd.set(_QN_FILL, color_hex)
     p_pr.append(shd)
 
 
+def _add_left_border(paragraph, color_hex):
+    """Add a colored single left border to a paragraph via XML manipulation."""
+    p_pr = paragraph._p.get_or_add_pPr()
+    p_bdr = deepcopy(_PBDR_LEFT_TEMPLATE)
+    p_bdr.find(_QN_LEFT).set(_QN_COLOR, color_hex)
+    p_pr.append(p_bdr)
+
+
 # ---------------------------------------------------------------------------
 # List numbering (independent counter per Markdown list)
 # ---------------------------------------------------------------------------
@@ -263,23 +498,13 @@ def add_hyperlink(paragraph, url, text):
     )
 
     hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("r:id"), r_id)
+    hyperlink.set(_QN_RID, r_id)
 
     run_elem = OxmlElement("w:r")
-    rPr = OxmlElement("w:rPr")
-
-    color = OxmlElement("w:color")
-    color.set(qn("w:val"), "0563C1")
-    rPr.append(color)
-
-    underline = OxmlElement("w:u")
-    underline.set(qn("w:val"), "single")
-    rPr.append(underline)
-
-    run_elem.append(rPr)
+    run_elem.append(deepcopy(_HYPERLINK_RPR_TEMPLATE))
 
     text_elem = OxmlElement("w:t")
-    text_elem.set(qn("xml:space"), "preserve")
+    text_elem.set(_QN_XML_SPACE, "preserve")
     text_elem.text = text
     run_elem.append(text_elem)
 
@@ -290,23 +515,13 @@ def add_hyperlink(paragraph, url, text):
 def add_internal_hyperlink(paragraph, anchor, text):
     """Add a hyperlink to a bookmark within the same document."""
     hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("w:anchor"), anchor)
+    hyperlink.set(_QN_ANCHOR, anchor)
 
     run_elem = OxmlElement("w:r")
-    rPr = OxmlElement("w:rPr")
-
-    color = OxmlElement("w:color")
-    color.set(qn("w:val"), "0563C1")
-    rPr.append(color)
-
-    underline = OxmlElement("w:u")
-    underline.set(qn("w:val"), "single")
-    rPr.append(underline)
-
-    run_elem.append(rPr)
+    run_elem.append(deepcopy(_HYPERLINK_RPR_TEMPLATE))
 
     text_elem = OxmlElement("w:t")
-    text_elem.set(qn("xml:space"), "preserve")
+    text_elem.set(_QN_XML_SPACE, "preserve")
     text_elem.text = text
     run_elem.append(text_elem)
 
@@ -315,15 +530,48 @@ def add_internal_hyperlink(paragraph, anchor, text):
 
 
 def add_image(doc, url, base_dir):
-    """Resolve image path and add picture to document, scaled to fit page."""
+    """Resolve image path and add picture to document, scaled to fit page.
+
+    Dimensions (and existence) come from the map precomputed by
+    ``preprocess_image_dims`` (stashed on the document by ``convert_file``)
+    when available; images not seen during preprocessing fall back to
+    stat + sizing on the fly.
+    """
     img_path = resolve_image_path(url, base_dir)
-    if not img_path.exists():
-        doc.add_paragraph(f"[Image not found: {url}]")
-        return
-    width, height = calculate_image_dimensions(
-        img_path, MAX_IMAGE_WIDTH, MAX_IMAGE_HEIGHT
-    )
-    doc.add_picture(str(img_path), width=width, height=height)
+    dims = getattr(doc, "_image_dims", None)
+    path_key = str(img_path)
+    if dims is not None and path_key in dims:
+        cached = dims[path_key]
+        if cached is None:
+            doc.add_paragraph(f"[Image not found: {url}]")
+            return
+        width, height = cached
+    else:
+        if not img_path.exists():
+            doc.add_paragraph(f"[Image not found: {url}]")
+            return
+        width, height = calculate_image_dimensions(
+            img_path, MAX_IMAGE_WIDTH, MAX_IMAGE_HEIGHT
+        )
+
+    # Repeated images (logos, shared diagrams) skip the file re-open and
+    # decode in add_picture: the first occurrence's wp:inline element is
+    # cached per document, and duplicates get a clone pointing at the same
+    # embedded image part, with a fresh docPr id to keep ids unique.
+    cache = getattr(doc, "_picture_cache", None)
+    if cache is None:
+        cache = doc._picture_cache = {}
+    key = (path_key, width, height)
+    cached_inline = cache.get(key)
+    if cached_inline is not None:
+        new_inline = deepcopy(cached_inline)
+        new_inline.find(qn("wp:docPr")).set("id", str(doc.part.next_id))
+        drawing = OxmlElement("w:drawing")
+        drawing.append(new_inline)
+        doc.add_paragraph().add_run()._r.append(drawing)
+    else:
+        shape = doc.add_picture(str(img_path), width=width, height=height)
+        cache[key] = shape._inline
 
 
 # ---------------------------------------------------------------------------
@@ -340,17 +588,7 @@ def render_tokens(doc, tokens, base_dir):
 def render_block(doc, token, base_dir):
     """Dispatch to render_{type} by token type."""
     t = token["type"]
-    dispatch = {
-        "heading": render_heading,
-        "paragraph": render_paragraph,
-        "block_code": render_block_code,
-        "block_quote": render_block_quote,
-        "alert": render_alert,
-        "list": render_list,
-        "table": render_table,
-        "thematic_break": render_thematic_break,
-    }
-    handler = dispatch.get(t)
+    handler = _BLOCK_DISPATCH.get(t)
     if handler:
         if t in ("block_code", "thematic_break"):
             handler(doc, token)
@@ -361,7 +599,8 @@ def render_block(doc, token, base_dir):
 def render_heading(doc, token, base_dir):
     """Render a heading token."""
     global _bookmark_id_counter
-    level = token.get("attrs", {}).get("level", 1) if token.get("attrs") else 1
+    attrs = token.get("attrs") or {}
+    level = attrs.get("level", 1)
     heading = doc.add_heading(level=level)
     render_inline(heading, token.get("children", []), base_dir)
 
@@ -387,7 +626,7 @@ def render_paragraph(doc, token, base_dir):
 
     # Check if paragraph contains only an image
     if len(children) == 1 and children[0]["type"] == "image":
-        src = children[0].get("attrs", {}).get("src", "")
+        src = (children[0].get("attrs") or {}).get("src", "")
         if src:
             add_image(doc, src, base_dir)
         return
@@ -399,36 +638,45 @@ def render_paragraph(doc, token, base_dir):
 def render_block_code(doc, token):
     """Render a code block with Pygments syntax highlighting."""
     raw = token.get("raw", "") or token.get("text", "")
-    info = token.get("attrs", {}).get("info", "") if token.get("attrs") else ""
-    lang = info.split()[0] if info else ""
+    attrs = token.get("attrs") or {}
+    info = attrs.get("info", "")
+    # maxsplit=1: only the first word matters, don't split the whole string
+    lang = info.split(None, 1)[0] if info else ""
 
     # Strip trailing newline for cleaner rendering
     if raw.endswith("\n"):
         raw = raw[:-1]
 
-    try:
-        lexer = get_lexer_by_name(lang) if lang else TextLexer()
-    except Exception:
-        lexer = TextLexer()
+    lexer = _get_lexer(lang)
 
     para = doc.add_paragraph()
     set_paragraph_shading(para, CODE_BG_COLOR)
 
-    tokens_list = list(lex(raw, lexer))
-    for token_type, value in tokens_list:
-        if not value:
-            continue
-        run = para.add_run(value)
-        run.font.name = CODE_FONT
-        run.font.size = CODE_FONT_SIZE
+    # Merge adjacent tokens that resolve to the same style before emitting:
+    # lexed code is mostly same-styled neighbors (text, punctuation,
+    # operators), and every run is a full XML subtree, so coalescing cuts
+    # the element count severalfold.
+    merged = []  # [style, [text, ...]] pairs, in order
+    if lexer is _TEXT_LEXER:
+        # No highlighting possible: skip the lexing machinery entirely and
+        # emit the block as one unstyled run.
+        if raw:
+            merged.append([None, [raw]])
+    else:
+        for token_type, value in lex(raw, lexer):
+            if not value:
+                continue
+            # Whitespace renders identically under any style; treat it as
+            # unstyled without a lookup so it coalesces with plain runs.
+            style = None if value.isspace() else get_token_style(token_type)
+            if merged and merged[-1][0] == style:
+                merged[-1][1].append(value)
+            else:
+                merged.append([style, [value]])
 
-        style = get_token_style(token_type)
-        if style:
-            color_hex, bold, italic = style
-            if color_hex:
-                run.font.color.rgb = RGBColor.from_string(color_hex)
-            run.bold = bold
-            run.italic = italic
+    # One extend call attaches all runs at once instead of crossing into
+    # lxml per run.
+    para._p.extend(_fast_code_run("".join(parts), style) for style, parts in merged)
 
 
 def render_block_quote(doc, token, base_dir):
@@ -443,15 +691,7 @@ def render_block_quote(doc, token, base_dir):
             p_fmt.left_indent = Inches(0.5)
 
             # Add gray left border via XML
-            p_pr = para._p.get_or_add_pPr()
-            p_bdr = OxmlElement("w:pBdr")
-            left_bdr = OxmlElement("w:left")
-            left_bdr.set(qn("w:val"), "single")
-            left_bdr.set(qn("w:sz"), "12")
-            left_bdr.set(qn("w:space"), "4")
-            left_bdr.set(qn("w:color"), "999999")
-            p_bdr.append(left_bdr)
-            p_pr.append(p_bdr)
+            _add_left_border(para, "999999")
 
             render_inline(para, child.get("children", []), base_dir)
         else:
@@ -460,7 +700,7 @@ def render_block_quote(doc, token, base_dir):
 
 def render_alert(doc, token, base_dir):
     """Render a GitHub-style alert as a colored box with label and body."""
-    alert_type = token.get("attrs", {}).get("alert_type", "NOTE")
+    alert_type = (token.get("attrs") or {}).get("alert_type", "NOTE")
     border_color, bg_color, label_text, text_color = ALERT_STYLES[alert_type]
     children = token.get("children", [])
 
@@ -470,16 +710,7 @@ def render_alert(doc, token, base_dir):
         p_fmt.left_indent = Inches(0.5)
 
         set_paragraph_shading(para, bg_color)
-
-        p_pr = para._p.get_or_add_pPr()
-        p_bdr = OxmlElement("w:pBdr")
-        left_bdr = OxmlElement("w:left")
-        left_bdr.set(qn("w:val"), "single")
-        left_bdr.set(qn("w:sz"), "12")
-        left_bdr.set(qn("w:space"), "4")
-        left_bdr.set(qn("w:color"), border_color)
-        p_bdr.append(left_bdr)
-        p_pr.append(p_bdr)
+        _add_left_border(para, border_color)
 
     # Label paragraph
     label_para = doc.add_paragraph()
@@ -511,7 +742,7 @@ def render_list(doc, token, base_dir):
     any block children (tables, code blocks, alerts, image-only paragraphs,
     nested lists) emitted between items.
     """
-    attrs = token.get("attrs", {}) or {}
+    attrs = token.get("attrs") or {}
     ordered = attrs.get("ordered", False)
     children = token.get("children", [])
 
@@ -522,9 +753,7 @@ def render_list(doc, token, base_dir):
 
         # Check for task list item (type is task_list_item)
         is_task = item.get("type") == "task_list_item"
-        checked = (
-            item.get("attrs", {}).get("checked", False) if item.get("attrs") else False
-        )
+        checked = (item.get("attrs") or {}).get("checked", False)
 
         for j, child in enumerate(item_children):
             if child["type"] in ("paragraph", "block_text"):
@@ -535,7 +764,7 @@ def render_list(doc, token, base_dir):
                     len(inline_children) == 1
                     and inline_children[0].get("type") == "image"
                 ):
-                    src = inline_children[0].get("attrs", {}).get("src", "")
+                    src = (inline_children[0].get("attrs") or {}).get("src", "")
                     if src:
                         add_image(doc, src, base_dir)
                     continue
@@ -589,7 +818,7 @@ def render_table(doc, token, base_dir):
     aligns = []
     if head:
         for cell_token in head.get("children", []):
-            cell_attrs = cell_token.get("attrs", {}) or {}
+            cell_attrs = cell_token.get("attrs") or {}
             aligns.append(cell_attrs.get("align"))
 
     align_map = {
@@ -598,9 +827,15 @@ def render_table(doc, token, base_dir):
         "right": WD_ALIGN_PARAGRAPH.RIGHT,
     }
 
+    # Materialize the cell grid once: table.rows and row.cells rebuild
+    # their lxml-backed views (including merged-cell resolution) on every
+    # access, which is quadratic-ish when indexed per cell.
+    cell_grid = [row.cells for row in table.rows]
+
     for row_idx, (cells_list, is_header) in enumerate(all_rows):
+        doc_cells = cell_grid[row_idx]
         for col_idx, cell_token in enumerate(cells_list):
-            cell = table.rows[row_idx].cells[col_idx]
+            cell = doc_cells[col_idx]
             para = cell.paragraphs[0]
 
             cell_children = cell_token.get("children", [])
@@ -615,108 +850,137 @@ def render_thematic_break(doc, token):
     """Render a horizontal rule as a paragraph with bottom border."""
     para = doc.add_paragraph()
     p_pr = para._p.get_or_add_pPr()
-    p_bdr = OxmlElement("w:pBdr")
-    bottom_bdr = OxmlElement("w:bottom")
-    bottom_bdr.set(qn("w:val"), "single")
-    bottom_bdr.set(qn("w:sz"), "6")
-    bottom_bdr.set(qn("w:space"), "1")
-    bottom_bdr.set(qn("w:color"), "auto")
-    p_bdr.append(bottom_bdr)
-    p_pr.append(p_bdr)
+    p_pr.append(deepcopy(_PBDR_BOTTOM_TEMPLATE))
+
+
+# Block token type -> handler, built once after the render functions exist;
+# render_block previously rebuilt this dict on every call.
+_BLOCK_DISPATCH = {
+    "heading": render_heading,
+    "paragraph": render_paragraph,
+    "block_code": render_block_code,
+    "block_quote": render_block_quote,
+    "alert": render_alert,
+    "list": render_list,
+    "table": render_table,
+    "thematic_break": render_thematic_break,
+}
+
+
+def _fast_text_run(p_elem, text, bold, italic, strike):
+    """Append one prose run to *p_elem* as raw OOXML.
+
+    The prose counterpart of ``_fast_code_run``: rPr children are emitted
+    only for flags that are set (plain text gets a bare ``w:r``/``w:t``),
+    and newlines/tabs are translated to ``w:br``/``w:tab`` elements.
+    """
+    r = OxmlElement("w:r")
+    if bold or italic or strike:
+        rpr = OxmlElement("w:rPr")
+        if bold:
+            rpr.append(OxmlElement("w:b"))
+        if italic:
+            rpr.append(OxmlElement("w:i"))
+        if strike:
+            rpr.append(OxmlElement("w:strike"))
+        r.append(rpr)
+    _append_run_content(r, text)
+    p_elem.append(r)
+
+
+def _inline_text(paragraph, child, base_dir, bold, italic, strike):
+    raw = child.get("raw", "") or child.get("text", "") or child.get("children", "")
+    if isinstance(raw, list):
+        raw = extract_text(raw)
+    _fast_text_run(paragraph._p, raw, bold, italic, strike)
+
+
+def _inline_codespan(paragraph, child, base_dir, bold, italic, strike):
+    raw = child.get("raw", "") or child.get("text", "") or child.get("children", "")
+    if isinstance(raw, list):
+        raw = extract_text(raw)
+    run = paragraph.add_run(raw)
+    run.font.name = CODE_FONT
+    run.font.size = CODE_FONT_SIZE
+    if bold:
+        run.bold = True
+    if italic:
+        run.italic = True
+
+
+def _inline_link(paragraph, child, base_dir, bold, italic, strike):
+    attrs = child.get("attrs") or {}
+    url = attrs.get("url", "") or attrs.get("href", "")
+    link_text = extract_text(child.get("children", []))
+    if url and url.startswith("#"):
+        add_internal_hyperlink(paragraph, url[1:], link_text)
+    elif url:
+        add_hyperlink(paragraph, url, link_text)
+
+
+def _inline_image(paragraph, child, base_dir, bold, italic, strike):
+    src = (child.get("attrs") or {}).get("src", "")
+    if src:
+        add_image(paragraph._parent, src, base_dir)
+
+
+def _inline_softbreak(paragraph, child, base_dir, bold, italic, strike):
+    _fast_text_run(paragraph._p, "\n", False, False, False)
+
+
+def _inline_linebreak(paragraph, child, base_dir, bold, italic, strike):
+    run = paragraph.add_run()
+    run.add_break()
+
+
+# Inline leaf token type -> handler; mirrors render_block's dispatch so branch
+# selection is one dict hit per node instead of a linear if/elif chain.
+# strong/emphasis/strikethrough are handled in render_inline itself: they
+# only adjust formatting flags and descend.
+_INLINE_DISPATCH = {
+    "text": _inline_text,
+    "codespan": _inline_codespan,
+    "link": _inline_link,
+    "image": _inline_image,
+    "softbreak": _inline_softbreak,
+    "linebreak": _inline_linebreak,
+}
 
 
 def render_inline(
     paragraph, children, base_dir, bold=False, italic=False, strike=False
 ):
-    """Recursive inline renderer for text, strong, emphasis, code, links, etc."""
+    """Inline renderer for text, strong, emphasis, code, links, etc.
+
+    Iterative (explicit stack of child iterators plus formatting flags)
+    rather than recursive: nested strong/emphasis/strikethrough spans no
+    longer pay a Python frame and keyword re-packing per nesting level.
+    """
     if children is None:
         return
 
-    for child in children:
-        t = child["type"]
-
-        if t == "text":
-            raw = (
-                child.get("raw", "")
-                or child.get("text", "")
-                or child.get("children", "")
-            )
-            if isinstance(raw, list):
-                raw = extract_text(raw)
-            run = paragraph.add_run(raw)
-            if bold:
-                run.bold = True
-            if italic:
-                run.italic = True
-            if strike:
-                run.font.strike = True
-
-        elif t == "strong":
-            render_inline(
-                paragraph,
-                child.get("children", []),
-                base_dir,
-                bold=True,
-                italic=italic,
-                strike=strike,
-            )
-
-        elif t == "emphasis":
-            render_inline(
-                paragraph,
-                child.get("children", []),
-                base_dir,
-                bold=bold,
-                italic=True,
-                strike=strike,
-            )
-
-        elif t == "strikethrough":
-            render_inline(
-                paragraph,
-                child.get("children", []),
-                base_dir,
-                bold=bold,
-                italic=italic,
-                strike=True,
-            )
-
-        elif t == "codespan":
-            raw = (
-                child.get("raw", "")
-                or child.get("text", "")
-                or child.get("children", "")
-            )
-            if isinstance(raw, list):
-                raw = extract_text(raw)
-            run = paragraph.add_run(raw)
-            run.font.name = CODE_FONT
-            run.font.size = CODE_FONT_SIZE
-            if bold:
-                run.bold = True
-            if italic:
-                run.italic = True
-
-        elif t == "link":
-            attrs = child.get("attrs", {}) or {}
-            url = attrs.get("url", "") or attrs.get("href", "")
-            link_text = extract_text(child.get("children", []))
-            if url and url.startswith("#"):
-                add_internal_hyperlink(paragraph, url[1:], link_text)
-            elif url:
-                add_hyperlink(paragraph, url, link_text)
-
-        elif t == "image":
-            src = child.get("attrs", {}).get("src", "")
-            if src:
-                add_image(paragraph._parent, src, base_dir)
-
-        elif t == "softbreak":
-            paragraph.add_run("\n")
-
-        elif t == "linebreak":
-            run = paragraph.add_run()
-            run.add_break()
+    # Bind the dispatch lookup once: this loop runs for every inline node
+    # in the document, and a local is cheaper than a method lookup per child.
+    dispatch_get = _INLINE_DISPATCH.get
+    stack = [(iter(children), bold, italic, strike)]
+    while stack:
+        children_iter, bold, italic, strike = stack[-1]
+        for child in children_iter:
+            t = child["type"]
+            if t == "strong":
+                stack.append((iter(child.get("children") or []), True, italic, strike))
+                break
+            if t == "emphasis":
+                stack.append((iter(child.get("children") or []), bold, True, strike))
+                break
+            if t == "strikethrough":
+                stack.append((iter(child.get("children") or []), bold, italic, True))
+                break
+            handler = dispatch_get(t)
+            if handler:
+                handler(paragraph, child, base_dir, bold, italic, strike)
+        else:
+            stack.pop()
 
 
 # ---------------------------------------------------------------------------
@@ -737,28 +1001,28 @@ def convert_file(input_path, output_dir, theme=None, transparent_bg=False):
     md = create_parser()
     tokens = md(md_text)
 
-    # Preprocess mermaid diagrams
-    tokens = preprocess_mermaid(
+    # Fused preprocessing: mermaid diagrams, tables mistune lost inside
+    # list items, GitHub-style alerts, and image attr normalization, all
+    # applied in a single tree walk.
+    tokens = preprocess_all(
         tokens, base_dir, theme=theme, transparent_bg=transparent_bg
     )
 
-    # Re-parse tables that mistune lost inside list items
-    tokens = preprocess_tables_in_lists(tokens)
-
-    # Preprocess GitHub-style alerts
-    tokens = preprocess_alerts(tokens)
-
-    # Normalize image attrs (url -> src) -- runs last so it covers the
-    # paragraphs emitted by preprocess_mermaid and any re-parsed tables.
-    tokens = preprocess_images(tokens)
+    # Size every distinct image once; add_image looks dimensions up here
+    # instead of re-parsing headers per reference.
+    image_dims = preprocess_image_dims(tokens, base_dir)
 
     # Create document and render
     doc = Document()
+    doc._image_dims = image_dims
     render_tokens(doc, tokens, base_dir)
 
-    # Save
+    # Save: serialize the whole package in memory, then write it with a
+    # single sequential write instead of zip-member-sized chunks.
     output_path = output_dir / f"{input_path.name}.docx"
-    doc.save(str(output_path))
+    buf = io.BytesIO()
+    doc.save(buf)
+    output_path.write_bytes(buf.getvalue())
     return output_path
 
 
@@ -788,11 +1052,33 @@ def convert_file(input_path, output_dir, theme=None, transparent_bg=False):
     default=False,
     help="Use transparent background for Mermaid diagrams.",
 )
-def main(files, output, theme, transparent):
-    """Convert one or more Markdown files to DOCX format."""
-    for f in files:
-        out = convert_file(f, output, theme=theme, transparent_bg=transparent)
-        click.echo(f"Converted: {f} -> {out}")
+@click.option(
+    "--jobs",
+    "-j",
+    default=None,
+    type=int,
+    help="Number of files to convert in parallel (default: CPU count).",
+)
+def main(files, output, theme, transparent, jobs):
+    """Convert one or more Markdown files to DOCX format.
+
+    Conversions are independent and CPU-bound (parse, lex, XML build, zip),
+    so multiple files convert on a process pool, one worker per file up to
+    ``--jobs``. A single file (or ``--jobs 1``) converts in-process.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    convert = functools.partial(
+        convert_file, output_dir=output, theme=theme, transparent_bg=transparent
+    )
+    if jobs <= 1 or len(files) == 1:
+        for f in files:
+            click.echo(f"Converted: {f} -> {convert(f)}")
+        return
+    max_workers = min(len(files), jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for f, out in zip(files, pool.map(convert, files)):
+            click.echo(f"Converted: {f} -> {out}")
 
 
 if __name__ == "__main__":
@@ -34,6 +34,24 @@ def test_docx_cli_converts_file(tmp_path):
     assert (tmp_path / "basic.md.docx").exists()
 
 
+def test_docx_cli_converts_multiple_files_in_parallel(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(
+        m2d.main,
+        [
+            str(EXAMPLES / "basic.md"),
+            str(EXAMPLES / "alerts.md"),
+            "-o",
+            str(tmp_path),
+            "--jobs",
+            "2",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "basic.md.docx").exists()
+    assert (tmp_path / "alerts.md.docx").exists()
+
+
 def test_docx_cli_requires_file_argument():
     runner = CliRunner()
     result = runner.invoke(m2d.main, [])
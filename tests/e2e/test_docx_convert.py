@@ -37,6 +37,7 @@ def no_mermaid(monkeypatch):
         if "-o" in cmd:
             out_path = cmd[cmd.index("-o") + 1]
             shutil.copy(cat, out_path)
+        return subprocess.CompletedProcess(cmd, 0)
 
     monkeypatch.setattr(subprocess, "run", fake_run)
 
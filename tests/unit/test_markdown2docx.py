@@ -2,6 +2,7 @@
 
 from docx import Document
 from docx.oxml.ns import qn
+from docx.shared import RGBColor
 from pygments.token import Comment, Keyword, Name, Text
 
 import markdown2docx as m2d
@@ -75,14 +76,14 @@ def _find_bottom_border(para):
 
 def test_get_token_style_exact_match():
     style = get_token_style(Keyword)
-    assert style == ("0000FF", True, False)
+    assert style == (RGBColor.from_string("0000FF"), True, False)
 
 
 def test_get_token_style_walks_to_parent():
     # Name.Variable has no entry; should walk up but eventually return None
     # Name.Function has an entry; confirm we find it via Name.Function itself
     style = get_token_style(Name.Function)
-    assert style == ("795E26", False, False)
+    assert style == (RGBColor.from_string("795E26"), False, False)
 
 
 def test_get_token_style_returns_none_for_unmapped_root():
@@ -92,7 +93,12 @@ def test_get_token_style_returns_none_for_unmapped_root():
 def test_get_token_style_inherits_from_parent_token():
     # Comment.Multiline has no direct entry; should inherit from Comment
     style = get_token_style(Comment.Multiline)
-    assert style == ("008000", False, True)
+    assert style == (RGBColor.from_string("008000"), False, True)
+
+
+def test_get_token_style_color_is_preparsed_rgbcolor():
+    rgb, _, _ = get_token_style(Keyword)
+    assert isinstance(rgb, RGBColor)
 
 
 # ---------------------------------------------------------------------------
@@ -157,6 +163,75 @@ def test_calculate_image_dimensions_zero_dim_returns_maxes(monkeypatch):
     assert h == max_h
 
 
+# ---------------------------------------------------------------------------
+# preprocess_image_dims
+# ---------------------------------------------------------------------------
+
+
+def test_preprocess_image_dims_sizes_existing_image(small_jpeg):
+    tokens = [
+        {
+            "type": "paragraph",
+            "children": [{"type": "image", "attrs": {"src": small_jpeg.name}}],
+        }
+    ]
+    dims = m2d.preprocess_image_dims(tokens, str(small_jpeg.parent))
+    assert str(small_jpeg) in dims
+    width, height = dims[str(small_jpeg)]
+    assert width > 0 and height > 0
+
+
+def test_preprocess_image_dims_records_missing_image_as_none(tmp_path):
+    tokens = [
+        {
+            "type": "paragraph",
+            "children": [{"type": "image", "attrs": {"src": "nope.png"}}],
+        }
+    ]
+    dims = m2d.preprocess_image_dims(tokens, str(tmp_path))
+    assert dims == {str(tmp_path / "nope.png"): None}
+
+
+def test_preprocess_image_dims_dedupes_repeated_references(small_jpeg, monkeypatch):
+    calls = []
+    real = m2d.calculate_image_dimensions
+
+    def counting(img_path, max_w, max_h):
+        calls.append(img_path)
+        return real(img_path, max_w, max_h)
+
+    monkeypatch.setattr(m2d, "calculate_image_dimensions", counting)
+    para = {
+        "type": "paragraph",
+        "children": [{"type": "image", "attrs": {"src": small_jpeg.name}}],
+    }
+    m2d.preprocess_image_dims([para, para], str(small_jpeg.parent))
+    assert len(calls) == 1
+
+
+# ---------------------------------------------------------------------------
+# add_image
+# ---------------------------------------------------------------------------
+
+
+def test_add_image_duplicates_share_embedded_part(make_doc, small_jpeg):
+    doc = make_doc()
+    m2d.add_image(doc, small_jpeg.name, str(small_jpeg.parent))
+    m2d.add_image(doc, small_jpeg.name, str(small_jpeg.parent))
+    blips = doc.element.body.findall(".//" + qn("a:blip"))
+    assert len(blips) == 2
+    embeds = [b.get(qn("r:embed")) for b in blips]
+    assert embeds[0] == embeds[1]
+
+
+def test_add_image_duplicates_get_unique_docpr_ids(make_doc, small_jpeg):
+    doc = make_doc()
+    m2d.add_image(doc, small_jpeg.name, str(small_jpeg.parent))
+    m2d.add_image(doc, small_jpeg.name, str(small_jpeg.parent))
+    ids = [pr.get("id") for pr in doc.element.body.findall(".//" + qn("wp:docPr"))]
+    assert len(ids) == len(set(ids))
+
+
 # ---------------------------------------------------------------------------
 # set_paragraph_shading
 # ---------------------------------------------------------------------------
@@ -296,6 +371,50 @@ def test_render_block_code_uses_code_font(make_doc):
     assert all(r.font.name == CODE_FONT for r in runs if r.text)
 
 
+def test_render_block_code_styles_keyword_runs(make_doc):
+    doc = make_doc()
+    token = {"type": "block_code", "raw": "def f():\n", "attrs": {"info": "python"}}
+    render_block_code(doc, token)
+    keyword_run = next(r for r in doc.paragraphs[-1].runs if r.text == "def")
+    assert keyword_run.bold is True
+    assert keyword_run.font.color.rgb == RGBColor.from_string("0000FF")
+    assert keyword_run.font.size.pt == 9
+
+
+def test_render_block_code_multiline_emits_br_elements(make_doc):
+    doc = make_doc()
+    token = {
+        "type": "block_code",
+        "raw": "x = 1\ny = 2\n",
+        "attrs": {"info": "python"},
+    }
+    render_block_code(doc, token)
+    p = doc.paragraphs[-1]._p
+    # Word ignores literal newlines in w:t; line breaks must be w:br elements.
+    assert p.findall(".//" + qn("w:br"))
+    assert all("\n" not in (t.text or "") for t in p.findall(".//" + qn("w:t")))
+
+
+def test_render_block_code_tabs_become_tab_elements(make_doc):
+    doc = make_doc()
+    token = {"type": "block_code", "raw": "a\tb", "attrs": {}}
+    render_block_code(doc, token)
+    p = doc.paragraphs[-1]._p
+    assert p.findall(".//" + qn("w:tab"))
+    assert all("\t" not in (t.text or "") for t in p.findall(".//" + qn("w:t")))
+
+
+def test_render_block_code_preserves_indentation_whitespace(make_doc):
+    doc = make_doc()
+    token = {
+        "type": "block_code",
+        "raw": "if x:\n    y = 1\n",
+        "attrs": {"info": "python"},
+    }
+    render_block_code(doc, token)
+    assert "    y = 1" in doc.paragraphs[-1].text
+
+
 def test_render_block_code_applies_shading(make_doc):
     doc = make_doc()
     token = {"type": "block_code", "raw": "x = 1", "attrs": {"info": "python"}}
@@ -718,6 +837,20 @@ def test_render_inline_softbreak_adds_newline(make_doc, tmp_path):
     assert "\n" in "".join(r.text for r in para.runs)
 
 
+def test_render_inline_softbreak_emits_br_element(make_doc, tmp_path):
+    doc = make_doc()
+    para = doc.add_paragraph()
+    children = [
+        {"type": "text", "raw": "a"},
+        {"type": "softbreak"},
+        {"type": "text", "raw": "b"},
+    ]
+    render_inline(para, children, str(tmp_path))
+    # The break must be a w:br element; Word ignores literal newlines in w:t.
+    assert para._p.findall(".//" + qn("w:br"))
+    assert all("\n" not in (t.text or "") for t in para._p.findall(".//" + qn("w:t")))
+
+
 def test_render_inline_linebreak_adds_break_element(make_doc, tmp_path):
     doc = make_doc()
     para = doc.add_paragraph()
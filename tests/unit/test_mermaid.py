@@ -1,23 +1,26 @@
 """Unit tests for lib.mermaid."""
 
+import subprocess
+
 import pytest
 
-from lib.mermaid import MERMAID_THEMES, preprocess_mermaid
+from lib.mermaid import MERMAID_THEMES, MMDC_TIMEOUT, preprocess_mermaid
 
 
 @pytest.fixture
 def fake_mmdc(tmp_path, monkeypatch):
-    """Redirect ``TEMP_DIR`` to tmp_path and stub out ``subprocess.run``.
+    """Redirect ``_temp_dir()`` to tmp_path and stub out ``subprocess.run``.
 
     Returns a list that records each captured invocation as
-    ``{"cmd": [...], "kwargs": {...}}``.
+    ``{"cmd": [...], "kwargs": {...}}``. Each stubbed run succeeds.
     """
     calls = []
 
     def fake_run(cmd, **kwargs):
         calls.append({"cmd": cmd, "kwargs": kwargs})
+        return subprocess.CompletedProcess(cmd, 0)
 
-    monkeypatch.setattr("lib.mermaid.TEMP_DIR", tmp_path)
+    monkeypatch.setattr("lib.mermaid._temp_dir", lambda: tmp_path)
     monkeypatch.setattr("lib.mermaid.subprocess.run", fake_run)
     return calls
 
@@ -57,11 +60,64 @@ def test_preprocess_mermaid_leaves_plain_code_blocks_with_no_info(fake_mmdc, tmp
     assert fake_mmdc == []
 
 
-def test_preprocess_mermaid_invokes_mmdc_with_check_true(fake_mmdc, tmp_path):
+def test_temp_dir_derives_from_tempfile_and_is_cached(tmp_path, monkeypatch):
+    from lib.mermaid import _temp_dir
+
+    monkeypatch.setattr("lib.mermaid.tempfile.gettempdir", lambda: str(tmp_path))
+    _temp_dir.cache_clear()
+    try:
+        assert _temp_dir() == tmp_path / "markdown2docx"
+        assert _temp_dir() is _temp_dir()
+    finally:
+        _temp_dir.cache_clear()
+
+
+def test_preprocess_mermaid_no_diagrams_does_not_create_temp_dir(tmp_path, monkeypatch):
+    temp_dir = tmp_path / "mermaid_tmp"
+    monkeypatch.setattr("lib.mermaid._temp_dir", lambda: temp_dir)
+    tokens = [{"type": "paragraph", "children": [{"type": "text", "raw": "x"}]}]
+    preprocess_mermaid(tokens, tmp_path)
+    assert not temp_dir.exists()
+
+
+def test_preprocess_mermaid_invokes_mmdc_with_timeout(fake_mmdc, tmp_path):
     preprocess_mermaid([_mermaid_block()], tmp_path)
     assert len(fake_mmdc) == 1
     assert fake_mmdc[0]["cmd"][0] == "mmdc"
-    assert fake_mmdc[0]["kwargs"]["check"] is True
+    assert fake_mmdc[0]["kwargs"]["check"] is False
+    assert fake_mmdc[0]["kwargs"]["timeout"] == MMDC_TIMEOUT
+    assert fake_mmdc[0]["kwargs"]["capture_output"] is True
+
+
+def test_preprocess_mermaid_failed_render_becomes_error_paragraph(
+    tmp_path, monkeypatch
+):
+    def failing_run(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 1, stderr=b"Parse error on line 2")
+
+    monkeypatch.setattr("lib.mermaid._temp_dir", lambda: tmp_path)
+    monkeypatch.setattr("lib.mermaid.subprocess.run", failing_run)
+    result = preprocess_mermaid([_mermaid_block("bad")], tmp_path)
+    assert result[0]["type"] == "paragraph"
+    text = result[0]["children"][0]
+    assert text["type"] == "text"
+    assert text["raw"] == "[Mermaid error: Parse error on line 2]"
+
+
+def test_preprocess_mermaid_one_failure_does_not_stop_other_renders(
+    tmp_path, monkeypatch
+):
+    def mixed_run(cmd, **kwargs):
+        mmd_path = cmd[cmd.index("-i") + 1]
+        if "bad" in open(mmd_path).read():
+            return subprocess.CompletedProcess(cmd, 1, stderr=b"boom")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr("lib.mermaid._temp_dir", lambda: tmp_path)
+    monkeypatch.setattr("lib.mermaid.subprocess.run", mixed_run)
+    result = preprocess_mermaid([_mermaid_block("bad"), _mermaid_block("ok")], tmp_path)
+    assert result[0]["children"][0]["type"] == "text"
+    assert result[1]["children"][0]["type"] == "image"
 
 
 def test_preprocess_mermaid_passes_input_and_output_paths(fake_mmdc, tmp_path):
@@ -99,14 +155,44 @@ def test_preprocess_mermaid_omits_transparent_bg_flag_when_false(fake_mmdc, tmp_
     assert "-b" not in fake_mmdc[0]["cmd"]
 
 
-def test_preprocess_mermaid_counter_increments_across_blocks(fake_mmdc, tmp_path):
+def test_preprocess_mermaid_distinct_sources_get_distinct_paths(fake_mmdc, tmp_path):
     tokens = [_mermaid_block("a"), _mermaid_block("b")]
     result = preprocess_mermaid(tokens, tmp_path)
     src_a = result[0]["children"][0]["attrs"]["src"]
     src_b = result[1]["children"][0]["attrs"]["src"]
     assert src_a != src_b
-    assert "_0_" in src_a
-    assert "_1_" in src_b
+
+
+def test_preprocess_mermaid_skips_mmdc_when_png_cached(fake_mmdc, tmp_path):
+    # First run records the output path mmdc would have written.
+    result = preprocess_mermaid([_mermaid_block()], tmp_path)
+    assert len(fake_mmdc) == 1
+    png_path = result[0]["children"][0]["attrs"]["src"]
+
+    # Simulate mmdc having produced the PNG; the same source re-renders
+    # without spawning a subprocess.
+    from pathlib import Path
+
+    Path(png_path).write_bytes(b"png")
+    preprocess_mermaid([_mermaid_block()], tmp_path)
+    assert len(fake_mmdc) == 1
+
+
+def test_preprocess_mermaid_identical_sources_render_once(fake_mmdc, tmp_path):
+    tokens = [_mermaid_block("same"), _mermaid_block("same")]
+    result = preprocess_mermaid(tokens, tmp_path)
+    src_a = result[0]["children"][0]["attrs"]["src"]
+    src_b = result[1]["children"][0]["attrs"]["src"]
+    assert src_a == src_b
+    assert len(fake_mmdc) == 1
+
+
+def test_preprocess_mermaid_hash_includes_render_options(fake_mmdc, tmp_path):
+    plain = preprocess_mermaid([_mermaid_block()], tmp_path)
+    themed = preprocess_mermaid([_mermaid_block()], tmp_path, theme="dark")
+    src_plain = plain[0]["children"][0]["attrs"]["src"]
+    src_themed = themed[0]["children"][0]["attrs"]["src"]
+    assert src_plain != src_themed
 
 
 def test_preprocess_mermaid_recurses_into_list_items(fake_mmdc, tmp_path):
@@ -155,6 +155,10 @@ def test_resolve_image_path_returns_path_object():
     assert isinstance(resolve_image_path("x.png", "."), Path)
 
 
+def test_resolve_image_path_caches_repeated_lookups():
+    assert resolve_image_path("logo.png", ".") is resolve_image_path("logo.png", ".")
+
+
 # ---------------------------------------------------------------------------
 # create_parser
 # ---------------------------------------------------------------------------
@@ -200,6 +204,19 @@ def test_create_parser_enables_task_lists_plugin():
     assert "task_list_item" in item_types
 
 
+def test_create_parser_returns_cached_instance():
+    assert create_parser() is create_parser()
+
+
+def test_create_parser_cached_instance_is_reusable():
+    parser = create_parser()
+    first = parser("# One\n")
+    second = parser("# Two\n")
+    assert first[0]["type"] == "heading"
+    assert second[0]["type"] == "heading"
+    assert first is not second
+
+
 # ---------------------------------------------------------------------------
 # walk_block_containers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,123 @@
+"""Unit tests for lib.preprocess (fused preprocessing walk)."""
+
+import subprocess
+
+import pytest
+
+from lib.preprocess import preprocess_all
+
+
+@pytest.fixture
+def fake_mmdc(tmp_path, monkeypatch):
+    """Redirect ``_temp_dir()`` to tmp_path and stub out ``subprocess.run``."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append({"cmd": cmd, "kwargs": kwargs})
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr("lib.mermaid._temp_dir", lambda: tmp_path)
+    monkeypatch.setattr("lib.mermaid.subprocess.run", fake_run)
+    return calls
+
+
+def test_preprocess_all_replaces_mermaid_block(fake_mmdc, tmp_path):
+    tokens = [{"type": "block_code", "raw": "graph", "attrs": {"info": "mermaid"}}]
+    result = preprocess_all(tokens, str(tmp_path))
+    assert result[0]["type"] == "paragraph"
+    assert result[0]["children"][0]["type"] == "image"
+    assert len(fake_mmdc) == 1
+
+
+def test_preprocess_all_converts_alert_blockquote(tmp_path):
+    tokens = [
+        {
+            "type": "block_quote",
+            "children": [
+                {
+                    "type": "paragraph",
+                    "children": [
+                        {"type": "text", "raw": "["},
+                        {"type": "text", "raw": "!NOTE]"},
+                        {"type": "softbreak"},
+                        {"type": "text", "raw": "Body"},
+                    ],
+                }
+            ],
+        }
+    ]
+    result = preprocess_all(tokens, str(tmp_path))
+    assert result[0]["type"] == "alert"
+    assert result[0]["attrs"]["alert_type"] == "NOTE"
+
+
+def test_preprocess_all_normalizes_image_attrs(tmp_path):
+    tokens = [
+        {
+            "type": "paragraph",
+            "children": [{"type": "image", "attrs": {"url": "pic.png"}}],
+        }
+    ]
+    preprocess_all(tokens, str(tmp_path))
+    assert tokens[0]["children"][0]["attrs"] == {"src": "pic.png"}
+
+
+def test_preprocess_all_normalizes_images_inside_alert_body(tmp_path):
+    tokens = [
+        {
+            "type": "block_quote",
+            "children": [
+                {
+                    "type": "paragraph",
+                    "children": [
+                        {"type": "text", "raw": "["},
+                        {"type": "text", "raw": "!TIP]"},
+                    ],
+                },
+                {
+                    "type": "paragraph",
+                    "children": [{"type": "image", "attrs": {"url": "in.png"}}],
+                },
+            ],
+        }
+    ]
+    result = preprocess_all(tokens, str(tmp_path))
+    body_image = result[0]["children"][0]["children"][0]
+    assert body_image["attrs"] == {"src": "in.png"}
+
+
+def test_preprocess_all_reparses_table_in_list_item(tmp_path):
+    tokens = [
+        {
+            "type": "list",
+            "children": [
+                {
+                    "type": "list_item",
+                    "children": [
+                        {
+                            "type": "paragraph",
+                            "children": [
+                                {"type": "text", "raw": "| a | b |"},
+                                {"type": "softbreak"},
+                                {"type": "text", "raw": "| - | - |"},
+                                {"type": "softbreak"},
+                                {"type": "text", "raw": "| 1 | 2 |"},
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+    ]
+    preprocess_all(tokens, str(tmp_path))
+    child_types = [c["type"] for c in tokens[0]["children"][0]["children"]]
+    assert "table" in child_types
+
+
+def test_preprocess_all_leaves_plain_tokens_untouched(tmp_path):
+    tokens = [
+        {"type": "heading", "attrs": {"level": 1}, "children": [{"raw": "H"}]},
+        {"type": "paragraph", "children": [{"type": "text", "raw": "x"}]},
+    ]
+    result = preprocess_all(tokens, str(tmp_path))
+    assert [t["type"] for t in result] == ["heading", "paragraph"]